@@ -22,8 +22,10 @@ along with this program. If not, see https://www.gnu.org/licenses/
 """
 import io
 import os
+import re
 import csv
 import doctest
+import warnings
 import unittest
 from pathlib import Path
 from functools import partial
@@ -100,6 +102,14 @@ class Toa5TestCase(unittest.TestCase):
             ("TS","RN","Volts","Deg C","Deg C","Deg C","% "),
             ("","","Avg","Min","Max","Smp","Avg"),
         ) )
+        # str subclasses are accepted
+        class MyStr(str):
+            pass
+        _, columns = toa5.read_header(iter( tuple(map(MyStr, row)) for row in (
+            ('TOA5','sn','lm','ls','os','pn','ps','tn'), ('Foo',), ('V',), ('Avg',) ) ))
+        self.assertEqual(columns, (toa5.ColumnHeader('Foo','V','Avg'),))
+        self.assertEqual(toa5.short_name(columns[0]), 'Foo/Avg[V]')
+        self.assertEqual(toa5.sql_col_hdr_transform(columns[0]), 'foo_avg')
 
     def test_bad_toa5(self):
         # various bad TOA5 files
@@ -108,17 +118,32 @@ class Toa5TestCase(unittest.TestCase):
                 csv_rd = csv.reader(fh, strict=True)
                 with self.assertRaises(toa5.Toa5Error):
                     toa5.read_header(csv_rd)
+        # error messages
+        for data, msg in (
+                ('hello,world\n"a"b,c\n', "not a TOA5 file?"),
+                ('"TOA5"x,sn\n', "CSV parse error on environment line"),
+                ('TOA5,sn,lm,ls,os,pn,ps,tn\nFoo\n"a"b\n', "CSV parse error on headers"),
+                ):
+            with self.assertRaises(toa5.Toa5Error) as cm:
+                toa5.read_header(csv.reader(io.StringIO(data), strict=True))
+            self.assertEqual(str(cm.exception), msg)
         # test allow_dupes
         dupe_cols = ( ('TOA5','sn','lm','ls','os','pn','ps','tn'),('Foo','Foo'),('',''),('','') )
-        with self.assertRaises(toa5.Toa5Error):
+        with self.assertRaises(toa5.Toa5Error) as cm:
             toa5.read_header(iter(dupe_cols))
+        self.assertEqual(str(cm.exception), "duplicate column name: 'Foo'")
         toa5.read_header(iter(dupe_cols), allow_dupes=True)
+        with self.assertRaises(toa5.Toa5Error) as cm:
+            toa5.read_header(iter(( dupe_cols[0], ('x','Foo','y','x','Foo'), ('',)*5, ('',)*5 )))
+        self.assertEqual(str(cm.exception), "duplicate column names: 'x', 'Foo'")
 
     def test_col_valid(self):
         good_cols :tuple[toa5.ColumnHeader, ...] = (
             toa5.ColumnHeader("Hello"," & ","World"),
             toa5.ColumnHeader("Good_Col(1,2,3)","%$*","FooBar_Quz"),
             toa5.ColumnHeader("_xyz_","°C","Test-Data-Process"),
+            toa5.ColumnHeader("$Foo","",""),
+            toa5.ColumnHeader("Foo","","--"),
         )
         bad_cols :tuple[toa5.ColumnHeader, ...] = (
             toa5.ColumnHeader("","",""),
@@ -133,6 +158,10 @@ class Toa5TestCase(unittest.TestCase):
             toa5.ColumnHeader("Foo","","x*"),
             toa5.ColumnHeader("Foo","","x "),
             toa5.ColumnHeader("Foo",""," x"),
+            toa5.ColumnHeader("Fö","",""),
+            toa5.ColumnHeader("Foo","","Mö"),
+            toa5.ColumnHeader("Foo","","x"*33),
+            toa5.ColumnHeader("x"*256,"",""),
         )
         for col in good_cols:
             self.assertEqual( col.simple_checks(strict=True), '' )
@@ -142,6 +171,21 @@ class Toa5TestCase(unittest.TestCase):
                 col.simple_checks()
             self.assertTrue( col.simple_checks(strict=False) )
 
+    def test_col_unit_re(self):
+        # the unit regex used to be built from this character class, make sure it's still equivalent
+        old_re = re.compile(r'\A['
+            + bytes(range(0x20, 0x7F)).decode('ASCII')
+            .replace("\\",'').replace('-',r'\-').replace(']',r'\]')
+            .replace(bytes(range(ord('A'),ord('Z')+1)).decode('ASCII'), 'A-Z')
+            .replace(bytes(range(ord('a'),ord('z')+1)).decode('ASCII'), 'a-z')
+            .replace(bytes(range(ord('0'),ord('9')+1)).decode('ASCII'), '0-9')
+            + r'°]{0,64}\Z')
+        unit_re = toa5._col_unit_re()  # pyright: ignore [reportPrivateUsage]  # pylint: disable=protected-access
+        for i in range(0x400):
+            self.assertEqual( bool(unit_re.fullmatch(chr(i))), bool(old_re.fullmatch(chr(i))), hex(i) )
+        self.assertTrue( unit_re.fullmatch('x'*64) )
+        self.assertFalse( unit_re.fullmatch('x'*65) )
+
     def test_col_trans(self):
         # check the transformation functions
         for tp in _exp_hdr.values():
@@ -151,10 +195,27 @@ class Toa5TestCase(unittest.TestCase):
         # errors and warnings from default_col_hdr_transform
         with self.assertRaises(ValueError):
             toa5.short_name(toa5.ColumnHeader("Foo[x]","",""))
+        self.assertEqual(toa5.short_name(toa5.ColumnHeader("Foo[x]","",""), strict=False), 'Foo[x]')
         with self.assertWarns(toa5.Toa5Warning) as cm:
             self.assertEqual(toa5.short_name(toa5.ColumnHeader("Foo-Bar","","")), 'Foo-Bar')
         self.assertEqual(len(cm.warnings), 1)
         self.assertEqual(str(cm.warnings[0].message), "Unusual column name 'Foo-Bar'")
+        # the results are cached, but the warning must still be issued
+        with self.assertWarns(toa5.Toa5Warning):
+            self.assertEqual(toa5.short_name(toa5.ColumnHeader("Foo-Bar","","")), 'Foo-Bar')
+        # SHORTER_UNITS is read-only
+        with self.assertRaises(TypeError):
+            toa5.SHORTER_UNITS['Wibble'] = 'W'  # type: ignore[index]  # pyright: ignore [reportIndexIssue]
+        self.assertNotIn('Wibble', toa5.SHORTER_UNITS)
+        # units that are shortened to nothing
+        self.assertEqual(toa5.short_name(toa5.ColumnHeader("Foo","unitless","")), 'Foo')
+        self.assertEqual(toa5.short_name(toa5.ColumnHeader("Foo","Volts",""), short_units={"Volts":""}), 'Foo')
+        # name and data process differing only in case
+        self.assertEqual(toa5.short_name(toa5.ColumnHeader("Foo_avg","","Avg")), 'Foo_avg')
+        self.assertEqual(toa5.sql_col_hdr_transform(toa5.ColumnHeader("Foo_avg","","Avg")), 'foo_avg')
+        # str.lower() can change the length of a string, make sure that doesn't cause false matches
+        self.assertEqual(toa5.short_name(toa5.ColumnHeader("Fooİ","","i̇"), strict=False), 'Fooİ/i̇')
+        self.assertEqual(toa5.sql_col_hdr_transform(toa5.ColumnHeader("Fooİ","","i̇")), 'foo_i')
         # sql transform
         self.assertEqual(toa5.sql_col_hdr_transform(toa5.ColumnHeader('__Fö-x__Avg(1,2)','xyz','Avg')), 'f_x_avg_1_2')
         # test some claims from the documentation
@@ -217,6 +278,23 @@ class Toa5TestCase(unittest.TestCase):
             index=pandas.Index(name='xyz', data=[1,2]),
             data={ 'abc': [3,4] }  ) )
         self.assertEqual( df.attrs['toa5_env_line'], el )
+        # test other engines and options that make Pandas switch engines
+        other_args :tuple[dict[str, Any], ...] = ( {'engine':'python'}, {'delimiter':','}, {'skipfooter':1}, {'sep':None} )
+        for kw in other_args:
+            fh = io.StringIO(
+                "TOA5,sn,lm,ls,os,pn,ps,tn\n"
+                "RECORD,BattV_Min\n"
+                "RN,Volts\n"
+                ",Min\n"
+                "1,12\n"
+                "2,11.9\n"
+                + ( "3,11.8\n" if 'skipfooter' in kw else "" ))
+            with warnings.catch_warnings():  # Pandas warns when falling back to the Python engine
+                warnings.simplefilter('ignore', pandas.errors.ParserWarning)
+                df = toa5.read_pandas(fh, **kw)
+            assert_frame_equal(df, pandas.DataFrame(
+                index=pandas.Index(name='RECORD', data=[1,2]),
+                data={ 'BattV_Min[V]': [12,11.9] }  ) )
         # test reading from file instead of handle
         with NamedTempFileDeleteLater() as tf:
             tf.write(b"TOA5,sn,lm,ls,os,pn,ps,tn\n"
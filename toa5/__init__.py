@@ -59,10 +59,14 @@ import re
 import csv
 import warnings
 import importlib
+from functools import cache, lru_cache, partial
+from operator import itemgetter
+from itertools import islice
+from types import MappingProxyType
 from contextlib import nullcontext
 from typing import NamedTuple, Optional, Any
-from collections.abc import Iterator, Sequence, Generator, Callable
-from igbpyutils.iter import no_duplicates, zip_strict
+from collections import Counter
+from collections.abc import Iterator, Sequence, Generator, Callable, Mapping
 
 class Toa5Error(RuntimeError):
     """An error class for :func:`read_header`."""
@@ -87,15 +91,17 @@ class EnvironmentLine(NamedTuple):
     #: The name of the table contained in this TOA5 file
     table_name :str
 
-_col_name_re = re.compile(r'\A[A-Za-z_$][A-Za-z0-9_$]*(?:\([0-9]+(?:,[0-9]+)*\))?\Z')
-_col_unit_re = re.compile(r'\A['
-    + bytes(range(0x20, 0x7F)).decode('ASCII')
-    .replace("\\",'').replace('-',r'\-').replace(']',r'\]')
-    .replace(bytes(range(ord('A'),ord('Z')+1)).decode('ASCII'), 'A-Z')
-    .replace(bytes(range(ord('a'),ord('z')+1)).decode('ASCII'), 'a-z')
-    .replace(bytes(range(ord('0'),ord('9')+1)).decode('ASCII'), '0-9')
-    + r'°]{0,64}\Z')
-_col_prc_re = re.compile(r'\A[A-Za-z0-9_-]{0,32}\Z')
+# The following regexes are compiled on first use to keep ``import toa5`` cheap.
+@cache
+def _col_name_re() -> re.Pattern[str]:
+    return re.compile(r'\A[A-Za-z_$][A-Za-z0-9_$]*(?:\([0-9]+(?:,[0-9]+)*\))?\Z')
+@cache
+def _col_unit_re() -> re.Pattern[str]:
+    # printable ASCII (0x20-0x7E) except backslash (0x5C), plus the degree sign
+    return re.compile(r'\A[ -\[\]-~°]{0,64}\Z')
+@cache
+def _col_prc_re() -> re.Pattern[str]:
+    return re.compile(r'\A[A-Za-z0-9_-]{0,32}\Z')
 
 class ColumnHeader(NamedTuple):
     """Named tuple representing a column header.
@@ -137,21 +143,27 @@ class ColumnHeader(NamedTuple):
         :raises ValueError: When ``strict`` is on and any unusual values are detected.
         """
         problems :list[str] = []
-        if len(self.name)>255 or not _col_name_re.fullmatch(self.name):
+        # cheap string method checks accept the common cases before falling back to the regexes
+        # (note these methods accept non-ASCII characters, hence the isascii checks)
+        if len(self.name)>255 or not ( self.name.isascii() and self.name.isidentifier() or _col_name_re().fullmatch(self.name) ):
             problems.append(f"column name {self.name!r}")
-        if not _col_unit_re.fullmatch(self.unit):
+        if not _col_unit_re().fullmatch(self.unit):
             problems.append(f"unit {self.unit!r}")
-        if not _col_prc_re.fullmatch(self.prc):
+        if not ( len(self.prc)<=32 and ( not self.prc or self.prc.isascii() and self.prc.replace('_','').replace('-','').isalnum() )
+                 or _col_prc_re().fullmatch(self.prc) ):
             problems.append(f"data process {self.prc}")
         if strict and problems:
             raise ValueError(f"Unexpected {', '.join(problems)}")
         return f"Unusual {', '.join(problems)}" if problems else ''
 
+_timestamp_col = ColumnHeader(name='TIMESTAMP', unit='TS')
+_record_col = ColumnHeader(name='RECORD', unit='RN')
+
 #: A type for a function that takes a :class:`ColumnHeader` and turns it into a single string. See :func:`default_col_hdr_transform`.
 ColumnHeaderTransformer = Callable[[ColumnHeader], str]
 
-#: A table of shorter versions of common units, used in :func:`default_col_hdr_transform`.
-SHORTER_UNITS :dict[str, str] = {
+#: A read-only table of shorter versions of common units, used in :func:`default_col_hdr_transform`.
+SHORTER_UNITS :Mapping[str, str] = MappingProxyType({
     "meters/second": "m/s",
     "Deg C": "°C",
     "oC": "°C",
@@ -166,16 +178,24 @@ SHORTER_UNITS :dict[str, str] = {
     "degrees": "°",
     "Deg": "°",
     "unitless": ""
-}
+})
+
+@lru_cache(maxsize=128)
+def _prc_tail_re(prc :str) -> re.Pattern[str]:
+    return re.compile(re.escape(prc)+r'(?:\([^)]*\))?\Z', re.I)
 
 def _maybe_prc(col :ColumnHeader, sep :str) -> str:
     """Append the :attr:`~ColumnHeader.prc` if it's not already present at the end of the :attr:`~ColumnHeader.name`."""
-    if col.prc and not re.search(re.escape(col.prc)+r'(?:\([^)]*\))?\Z', col.name, re.I):
+    # the case-sensitive endswith covers the common case, the regex also handles case differences
+    # and names ending with indices, as in e.g. "Foo_Avg(1,2)"
+    if col.prc and not col.name.endswith(col.prc) and not _prc_tail_re(col.prc).search(col.name):
         return col.name.strip() + sep + col.prc.strip()
     return col.name.strip()
 
-_sql_trans_re = re.compile(r'[^A-Za-z_0-9]+')
-_sql_under_re = re.compile(r'_{2,}')
+@cache
+def _sql_clean_re() -> re.Pattern[str]:
+    # underscores are included here so that runs of them are also reduced to a single one
+    return re.compile(r'[^A-Za-z0-9]+')
 def sql_col_hdr_transform(col :ColumnHeader) -> str:
     """An alternative function that transforms a :class:`ColumnHeader` to a string suitable for use in SQL.
 
@@ -197,9 +217,32 @@ def sql_col_hdr_transform(col :ColumnHeader) -> str:
 
     :param col: The :class:`ColumnHeader` to process.
     """
-    return _sql_under_re.sub('_', _sql_trans_re.sub('_', _maybe_prc(col, '_'))).strip('_').lower()
-
-def default_col_hdr_transform(col :ColumnHeader, *, short_units :Optional[dict[str,str]] = None, strict :bool = True) -> str:
+    return _sql_clean_re().sub('_', _maybe_prc(col, '_')).strip('_').lower()
+
+@cache
+def _bad_col_chars_re() -> re.Pattern[str]:
+    return re.compile(r'[/\[\]]')
+def _default_col_hdr_transform(col :ColumnHeader, short_units :Mapping[str,str], strict :bool) -> tuple[str, str]:
+    """Implementation of :func:`default_col_hdr_transform`, returns the column name and the warning message, if any."""
+    w = ''
+    if strict:
+        if _bad_col_chars_re().search(col.name):
+            raise ValueError(f"Column name {col.name!r} may not contain any of '/[]'")
+        w = col.simple_checks(strict=False)
+    c = _maybe_prc(col, '/')
+    # cheap equality checks first, the unit lookup is only needed if there is a unit to append
+    if not col.unit or col.name=='TIMESTAMP' and col.unit=='TS' or col.name=='RECORD' and col.unit=='RN':
+        return c, w
+    unit = short_units.get(col.unit, col.unit)
+    if unit:
+        c += "[" + unit.strip() + "]"
+    return c, w
+
+@lru_cache(maxsize=4096)
+def _cached_default_col_hdr_transform(col :ColumnHeader) -> tuple[str, str]:
+    return _default_col_hdr_transform(col, SHORTER_UNITS, True)
+
+def default_col_hdr_transform(col :ColumnHeader, *, short_units :Optional[Mapping[str,str]] = None, strict :bool = True) -> str:
     """The default function used to transform a :class:`ColumnHeader` into a single string.
 
     This conversion is slightly opinionated and will:
@@ -217,23 +260,20 @@ def default_col_hdr_transform(col :ColumnHeader, *, short_units :Optional[dict[s
         column name contains the characters ``/[]``, which might cause duplicate column
         names in a table, and warn if :meth:`ColumnHeader.simple_checks` fails.
     """
-    if short_units is None:  # pragma: no branch
-        short_units = SHORTER_UNITS
-    if strict and any( x in col.name for x in '/[]' ):
-        raise ValueError(f"Column name {col.name!r} may not contain any of '/[]'")
-    if strict and (w := col.simple_checks(strict=False)):
+    if short_units is None and strict:
+        c, w = _cached_default_col_hdr_transform(col)
+    else:
+        c, w = _default_col_hdr_transform(col, SHORTER_UNITS if short_units is None else short_units, strict)
+    if w:
         warnings.warn(w, Toa5Warning)
-    c = _maybe_prc(col, '/')
-    if col.unit and \
-            not ( col.name=='TIMESTAMP' and col.unit=='TS' or col.name=='RECORD' and col.unit=='RN' ) \
-            and len(short_units.get(col.unit, col.unit)):
-        c += "[" + short_units.get(col.unit, col.unit).strip() + "]"
     return c
 
 #: A short alias for :func:`default_col_hdr_transform`.
 short_name = default_col_hdr_transform
 
 _env_line_keys = ('toa5',) + EnvironmentLine._fields
+# Since all three fields are always present here, this bypasses ColumnHeader.__new__ and its default handling.
+_new_col_hdr :Callable[[tuple[str, str, str]], ColumnHeader] = partial(tuple.__new__, ColumnHeader)
 def read_header(csv_reader :Iterator[Sequence[str]], *, allow_dupes :bool = False) -> tuple[EnvironmentLine, tuple[ColumnHeader, ...]]:
     """Read the header of a TOA5 file.
 
@@ -282,35 +322,34 @@ def read_header(csv_reader :Iterator[Sequence[str]], *, allow_dupes :bool = Fals
         raise Toa5Error("not a TOA5 file?")
     if len(_env_line_keys) != len(env_line):
         raise Toa5Error("TOA5 environment line length mismatch")
-    env_line_dict = dict(zip_strict(_env_line_keys, env_line))
+    # lengths were checked above, so no need for a strict zip here and below
+    env_line_dict = dict(zip(_env_line_keys, env_line))
     del env_line_dict['toa5']
     # ### Read the header rows
     try:
-        field_names = next(csv_reader)
-        units = next(csv_reader)
-        proc = next(csv_reader)
-    except StopIteration as ex:
-        raise Toa5Error("unexpected end of headers") from ex
+        hdr = list(islice(csv_reader, 3))
     except csv.Error as ex:
         raise Toa5Error("CSV parse error on headers") from ex
+    if len(hdr)<3:
+        raise Toa5Error("unexpected end of headers")
+    field_names, units, proc = hdr
     # ### Do some checks on the header
     if len(field_names) != len(units) or len(field_names) != len(proc):
         raise Toa5Error("header column count mismatch")
-    if not allow_dupes:
-        try:
-            set(no_duplicates(field_names, name='column name'))
-        except ValueError as ex:
-            raise Toa5Error(*ex.args)  # pylint: disable=raise-missing-from  # (we're just stealing the error message)
-    columns = tuple( ColumnHeader(*c) for c in zip_strict(field_names, units, proc) )
+    if not allow_dupes and len(set(field_names)) != len(field_names):
+        dupes = [ n for n, c in Counter(field_names).items() if c>1 ]
+        raise Toa5Error(f"duplicate column name{'s' if len(dupes)>1 else ''}: {', '.join(map(repr, dupes))}")
+    columns = tuple(map(_new_col_hdr, zip(field_names, units, proc)))
     return EnvironmentLine(**env_line_dict), columns
 
+_get_name, _get_unit, _get_prc = itemgetter(0), itemgetter(1), itemgetter(2)
 def write_header(env_line :EnvironmentLine, columns :Sequence[ColumnHeader]) -> Generator[Sequence[str], None, None]:
     """Convert an :class:`EnvironmentLine` and sequence of :class:`ColumnHeader` objects back
     into the four TOA5 header rows, suitable for use in e.g. :meth:`~csv.csvwriter.writerows`."""
     yield ('TOA5',)+env_line
-    yield tuple( c.name for c in columns )
-    yield tuple( c.unit for c in columns )
-    yield tuple( c.prc for c in columns )
+    yield tuple(map(_get_name, columns))
+    yield tuple(map(_get_unit, columns))
+    yield tuple(map(_get_prc, columns))
 
 def read_pandas(filepath_or_buffer, *, encoding :str = 'UTF-8', encoding_errors :str = 'strict',
                 col_trans :ColumnHeaderTransformer = default_col_hdr_transform, **kwargs):
@@ -356,10 +395,10 @@ def read_pandas(filepath_or_buffer, *, encoding :str = 'UTF-8', encoding_errors
         env_line, columns = read_header( csv.reader(fh, strict=True) )
         # Note Pandas doesn't allow dupes in `names`, so we should be ok here:
         args :dict[str, Any] = { 'header':None, 'names':[ col_trans(c) for c in columns ], 'na_values':['NAN'] }
-        if columns[0] == ColumnHeader(name='TIMESTAMP', unit='TS'):
+        if columns[0] == _timestamp_col:
             args['parse_dates'] = [0]
             args['index_col'] = [0]
-        elif columns[0] == ColumnHeader(name='RECORD', unit='RN'):
+        elif columns[0] == _record_col:
             args['index_col'] = [0]
         args.update(kwargs)
         df = pd.read_csv(filepath_or_buffer=fh, encoding=encoding, encoding_errors=encoding_errors, **args)